@@ -1,51 +1,99 @@
 import http.server
+import socket
 import socketserver
 import threading
+import time
 import urllib.parse
 
-class OAuthCallbackHandler(http.server.SimpleHTTPRequestHandler):
-    authorization_code = None
-    state = None
+_OK_BODY = b"""
+<html>
+<head><title>Authentication Successful</title></head>
+<body>
+    <h1>Authentication Successful!</h1>
+    <p>You can close this window and return to Claude Desktop.</p>
+</body>
+</html>
+"""
+_OK_BODY_LEN = str(len(_OK_BODY))
+_NOT_FOUND_BODY = b'Not found'
+_NOT_FOUND_BODY_LEN = str(len(_NOT_FOUND_BODY))
+
+class ReusableTCPServer(socketserver.TCPServer):
+    allow_reuse_address = True
     
     def __init__(self, *args, **kwargs):
+        self._done = threading.Event()
         super().__init__(*args, **kwargs)
+
+class OAuthCallbackHandler(http.server.BaseHTTPRequestHandler):
+    authorization_code = None
+    state = None
+    on_code_received = None
+    # Send the small response immediately instead of waiting on delayed ACKs
+    disable_nagle_algorithm = True
+    # Drop connections that never send a request (e.g. browser preconnects)
+    timeout = 10
     
     def do_GET(self):
-        parsed_path = urllib.parse.urlparse(self.path)
-        params = urllib.parse.parse_qs(parsed_path.query)
+        if not self.path.startswith('/oauth2callback?'):
+            self.send_response(404)
+            self.send_header('Content-type', 'text/html')
+            self.send_header('Content-Length', _NOT_FOUND_BODY_LEN)
+            self.end_headers()
+            self.wfile.write(_NOT_FOUND_BODY)
+            return
+        
+        query = self.path.split('?', 1)[1]
+        try:
+            params = dict(urllib.parse.parse_qsl(query, max_num_fields=16))
+        except ValueError:
+            params = {}
+        code, state = params.get('code'), params.get('state')
         
-        if parsed_path.path == '/oauth2callback':
-            if 'state' in params and 'code' in params:
-                OAuthCallbackHandler.state = params['state'][0]
-                OAuthCallbackHandler.authorization_code = params['code'][0]
-            
+        if code and state:
+            OAuthCallbackHandler.state = state
+            OAuthCallbackHandler.authorization_code = code
             self.send_response(200)
             self.send_header('Content-type', 'text/html')
+            self.send_header('Content-Length', _OK_BODY_LEN)
             self.end_headers()
-            self.wfile.write(bytes("""
-            <html>
-            <head><title>Authentication Successful</title></head>
-            <body>
-                <h1>Authentication Successful!</h1>
-                <p>You can close this window and return to Claude Desktop.</p>
-            </body>
-            </html>
-            """, "utf-8"))
-            
-            threading.Thread(target=self.server.shutdown).start()
+            self.wfile.write(_OK_BODY)
         else:
-            self.send_response(404)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            self.wfile.write(b'Not found')
+            self.send_error(400)
+        
+        # Notify on any callback (e.g. access_denied) so the flow doesn't wait for the timeout
+        if OAuthCallbackHandler.on_code_received:
+            OAuthCallbackHandler.on_code_received()
+        self.server._done.set()
 
     def log_message(self, format, *args):
         return
 
-def start_oauth_server(port):
-    handler = OAuthCallbackHandler
-    server = socketserver.TCPServer(("", port), handler)
+def create_oauth_server(port):
+    """Bind the callback server; raises OSError if the port is unavailable"""
+    server = ReusableTCPServer(("", port), OAuthCallbackHandler)
     print(f"Starting OAuth callback server on port {port}")
-    server.timeout = 300
-    server.serve_forever()
-    return server, handler 
\ No newline at end of file
+    return server
+
+def stop_oauth_server(server):
+    """Stop serving and release the port, even if a handler is still blocked"""
+    server._done.set()
+    try:
+        # Wakes up a handle_request() blocked in select() on Linux
+        server.socket.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    server.server_close()
+
+def start_oauth_server(server, timeout=300):
+    deadline = time.monotonic() + timeout
+    try:
+        while not server._done.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            server.timeout = remaining
+            server.handle_request()
+    finally:
+        server.server_close()
+    return server
\ No newline at end of file
@@ -1,15 +1,25 @@
 import os
 import json
+import functools
+import shutil
 import tempfile
 import webbrowser
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import threading
 from typing import Dict, List, Any, Optional, Literal
 from dataclasses import dataclass
 import asyncio
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Allow OAuth to work with HTTP for local development
 os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 
@@ -18,12 +28,19 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from oauth_server import OAuthCallbackHandler, start_oauth_server
+import google_auth_httplib2
+from googleapiclient.http import MediaFileUpload, build_http
+from oauth_server import (
+    OAuthCallbackHandler,
+    create_oauth_server,
+    start_oauth_server,
+    stop_oauth_server
+)
 
 mcp = FastMCP("youtube-upload", timeout=3600)
 
 PORT = 8080
+AUTH_TIMEOUT = 300  # 5 minutes
 SCOPES = [
     'https://www.googleapis.com/auth/youtube',
     'https://www.googleapis.com/auth/youtube.upload',
@@ -32,6 +49,8 @@ SCOPES = [
 ]
 TOKEN_PATH = os.path.join(Path.home(), '.youtube-upload-mcp-token.json')
 TEMP_DIR = os.path.join(tempfile.gettempdir(), 'youtube-upload-mcp')
+UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+UPLOAD_NUM_RETRIES = 5
 
 # Read CLIENT_ID and CLIENT_SECRET from environment variables
 CLIENT_ID = os.environ.get('YOUTUBE_CLIENT_ID')
@@ -40,6 +59,23 @@ CLIENT_SECRET = os.environ.get('YOUTUBE_CLIENT_SECRET')
 if not os.path.exists(TEMP_DIR):
     os.makedirs(TEMP_DIR, exist_ok=True)
 
+# Shared HTTP session so repeated downloads reuse pooled keep-alive connections
+_http = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+)
+_http.mount("https://", _http_adapter)
+_http.mount("http://", _http_adapter)
+
+# httplib2 connections are not thread-safe; uploads take turns on the shared one
+_upload_lock = asyncio.Lock()
+
+# In-memory copy of the token file so tool calls don't re-read it every time
+_cached_creds: Optional[Credentials] = None
+_cached_creds_mtime: float = 0.0
+
 PrivacyStatus = Literal["private", "public", "unlisted"]
 
 @dataclass
@@ -55,37 +91,126 @@ class UploadResponse:
     video_url: Optional[str] = None
 
 
+@functools.lru_cache(maxsize=4)
 def get_youtube_service(credentials):
-    """Create a YouTube API service object"""
-    return build('youtube', 'v3', credentials=credentials)
+    """Create a YouTube API service object, cached per credentials object"""
+    # build_http() handles 308 Resume Incomplete and sets a socket timeout
+    http = google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+    return build(
+        'youtube',
+        'v3',
+        http=http,
+        cache_discovery=False,
+        static_discovery=True
+    )
+
+
+def _seconds_until_expiry(credentials: Credentials) -> float:
+    """Seconds left before the access token expires (inf if it has no expiry)"""
+    if credentials.expiry is None:
+        return float('inf')
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return (credentials.expiry - now).total_seconds()
+
+
+def _read_credentials() -> Optional[Credentials]:
+    """Return credentials from TOKEN_PATH, re-parsing only if the file changed"""
+    global _cached_creds, _cached_creds_mtime
+    
+    # A single stat() both checks existence and detects external edits
+    try:
+        mtime = os.stat(TOKEN_PATH).st_mtime
+    except FileNotFoundError:
+        _cached_creds = None
+        return None
+    
+    if _cached_creds is not None and mtime == _cached_creds_mtime:
+        return _cached_creds
+    
+    with open(TOKEN_PATH, 'rb') as token_file:
+        token_data = _json_loads(token_file.read())
+    _cached_creds = Credentials.from_authorized_user_info(token_data, SCOPES)
+    _cached_creds_mtime = mtime
+    return _cached_creds
+
+
+def _needs_refresh(credentials: Credentials) -> bool:
+    return credentials.expired or _seconds_until_expiry(credentials) < 120
+
+
+def _store_credentials(credentials: Credentials) -> None:
+    """Write credentials to TOKEN_PATH and make them the cached copy"""
+    global _cached_creds, _cached_creds_mtime
+    
+    with open(TOKEN_PATH, 'w') as token_file:
+        token_file.write(credentials.to_json())
+    _cached_creds = credentials
+    _cached_creds_mtime = os.stat(TOKEN_PATH).st_mtime
+
+
+def _forget_credentials() -> None:
+    """Drop the cached credentials and delete TOKEN_PATH"""
+    global _cached_creds
+    
+    _cached_creds = None
+    if os.path.exists(TOKEN_PATH):
+        os.remove(TOKEN_PATH)
+
+
+def _refresh_credentials(credentials: Credentials) -> None:
+    """Refresh the access token and write it back to TOKEN_PATH"""
+    credentials.refresh(Request())
+    _store_credentials(credentials)
+
+
+def _load_credentials() -> Optional[Credentials]:
+    """Return valid credentials, touching disk/network only when needed
+    
+    Returns None if the user has not authenticated yet.
+    """
+    credentials = _cached_creds
+    if (
+        credentials is not None
+        and not credentials.expired
+        and _seconds_until_expiry(credentials) > 60
+    ):
+        return credentials
+    
+    credentials = _read_credentials()
+    if credentials is None:
+        return None
+    
+    if _needs_refresh(credentials) and credentials.refresh_token:
+        _refresh_credentials(credentials)
+    
+    return credentials
+
+
+async def _ensure_credentials() -> Optional[Credentials]:
+    """Load valid credentials without blocking the event loop"""
+    return await asyncio.to_thread(_load_credentials)
 
 
 @mcp.tool()
 async def check_auth_status() -> AuthResponse:
     """Check if the user is authenticated with YouTube"""
     try:
-        if not os.path.exists(TOKEN_PATH):
+        credentials = await asyncio.to_thread(_read_credentials)
+        if credentials is None:
             return AuthResponse(
                 authenticated=False,
                 message="User is not authenticated with YouTube."
             )
         
-        with open(TOKEN_PATH, 'r') as token_file:
-            token_data = json.load(token_file)
-        
-        credentials = Credentials.from_authorized_user_info(token_data, SCOPES)
-        
         if credentials.expired and credentials.refresh_token:
             try:
-                credentials.refresh(Request())
-                with open(TOKEN_PATH, 'w') as token_file:
-                    token_file.write(credentials.to_json())
+                await asyncio.to_thread(_refresh_credentials, credentials)
                 return AuthResponse(
                     authenticated=True,
                     message="User is authenticated with YouTube and token was refreshed."
                 )
             except Exception as e:
-                os.remove(TOKEN_PATH)
+                _forget_credentials()
                 return AuthResponse(
                     authenticated=False,
                     message=f"Authentication token expired and could not be refreshed: {str(e)}"
@@ -135,27 +260,39 @@ async def authenticate() -> Dict[str, Any]:
             prompt='consent'
         )
         
+        # Wake up as soon as the callback server receives the redirect
+        loop = asyncio.get_running_loop()
+        auth_event = asyncio.Event()
+        OAuthCallbackHandler.on_code_received = lambda: loop.call_soon_threadsafe(auth_event.set)
+        
+        # Bind before opening the browser so a busy port is reported right away
+        try:
+            server = create_oauth_server(PORT)
+        except OSError as e:
+            return {
+                "success": False,
+                "message": f"Could not start the OAuth callback server on port {PORT}: {str(e)}"
+            }
+        
         print(f"Please authorize this app by visiting this URL: {auth_url}")
         webbrowser.open(auth_url)
-        server_thread = threading.Thread(target=start_oauth_server, args=(PORT,))
+        server_thread = threading.Thread(
+            target=start_oauth_server,
+            args=(server, AUTH_TIMEOUT)
+        )
         server_thread.daemon = True
         server_thread.start()
         
-        # Wait for the callback with a timeout
-        timeout = 300  # 5 minutes
-        start_time = datetime.now()
-        
-        while server_thread.is_alive():
-            if (datetime.now() - start_time).total_seconds() > timeout:
-                return {
-                    "success": False,
-                    "message": "Authentication timed out. Please try again."
-                }
-            
-            if OAuthCallbackHandler.authorization_code and OAuthCallbackHandler.state:
-                break
-                
-            await asyncio.sleep(1)
+        # Wait for the callback; wait_for uses the loop's monotonic clock
+        try:
+            await asyncio.wait_for(auth_event.wait(), timeout=AUTH_TIMEOUT)
+        except asyncio.TimeoutError:
+            # Free the port now rather than relying on the server thread's deadline
+            stop_oauth_server(server)
+            return {
+                "success": False,
+                "message": "Authentication timed out. Please try again."
+            }
         
         if not OAuthCallbackHandler.authorization_code:
             return {
@@ -163,12 +300,15 @@ async def authenticate() -> Dict[str, Any]:
                 "message": "Failed to receive authorization code"
             }
         
-        callback_url = f"http://localhost:{PORT}/oauth2callback?state={OAuthCallbackHandler.state}&code={OAuthCallbackHandler.authorization_code}"
-        flow.fetch_token(authorization_response=callback_url)
+        if OAuthCallbackHandler.state != state:
+            return {
+                "success": False,
+                "message": "OAuth state mismatch. Please try authenticating again."
+            }
+        
+        await asyncio.to_thread(flow.fetch_token, code=OAuthCallbackHandler.authorization_code)
         
-        credentials = flow.credentials
-        with open(TOKEN_PATH, 'w') as token_file:
-            token_file.write(credentials.to_json())
+        await asyncio.to_thread(_store_credentials, flow.credentials)
         
         return {
             "success": True,
@@ -182,24 +322,55 @@ async def authenticate() -> Dict[str, Any]:
         }
 
 
+def _download_to_file(url: str, video_path: str) -> None:
+    """Stream the response body of url into video_path (blocking)"""
+    with _http.get(url, stream=True, timeout=(10, 60)) as response:
+        response.raise_for_status()
+        
+        response.raw.decode_content = True
+        with open(video_path, 'wb') as f:
+            # Hint that the file is written sequentially; its pages are kept so
+            # the upload can read them back from cache
+            # (posix_fadvise is unavailable on Windows and macOS)
+            if hasattr(os, 'posix_fadvise'):
+                try:
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+            shutil.copyfileobj(response.raw, f, length=1024 * 1024)
+
+
+def _drop_page_cache(video_path: str) -> None:
+    """Ask the kernel to evict a file we are done with from the page cache"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(video_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        # Only a hint; never fail an upload that already succeeded
+        pass
+
+
 async def download_video(url: str) -> Dict[str, Any]:
     """Download a video from a public URL
     
     Args:
         url: URL of the video to download
     """
+    video_path = None
     try:
         print(f"Downloading video from {url}")
         
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        video_path = os.path.join(TEMP_DIR, f"video_{timestamp}.mp4")
-        
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
+        # mkstemp picks a unique name atomically, so concurrent downloads never collide
+        fd, video_path = tempfile.mkstemp(prefix="video_", suffix=".mp4", dir=TEMP_DIR)
+        os.close(fd)
         
-        with open(video_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # Run the blocking transfer in a worker thread so the event loop stays responsive
+        await asyncio.to_thread(_download_to_file, url, video_path)
         
         return {
             "success": True,
@@ -208,6 +379,9 @@ async def download_video(url: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
+        # Don't leave an empty or partial file behind
+        if video_path and os.path.exists(video_path):
+            os.unlink(video_path)
         return {
             "success": False,
             "message": f"Failed to download video: {str(e)}"
@@ -218,7 +392,8 @@ async def upload_to_youtube(
     title: str,
     description: str,
     tags: Optional[List[str]] = None,
-    privacy_status: PrivacyStatus = "private"
+    privacy_status: PrivacyStatus = "private",
+    credentials: Optional[Credentials] = None
 ) -> Dict[str, Any]:
     """Upload a video to YouTube
     
@@ -228,10 +403,13 @@ async def upload_to_youtube(
         description: Description of the video
         tags: Optional list of video tags
         privacy_status: Privacy status (private/public/unlisted)
+        credentials: Already loaded credentials; loaded from the token cache if omitted
     """
     try:
         # Check if the user is authenticated
-        if not os.path.exists(TOKEN_PATH):
+        if credentials is None:
+            credentials = await _ensure_credentials()
+        if credentials is None:
             return {
                 "success": False,
                 "message": "User is not authenticated with YouTube. Please authenticate first."
@@ -243,16 +421,6 @@ async def upload_to_youtube(
                 "message": f"Video file not found at {video_path}"
             }
         
-        with open(TOKEN_PATH, 'r') as token_file:
-            token_data = json.load(token_file)
-        
-        credentials = Credentials.from_authorized_user_info(token_data, SCOPES)
-        
-        if credentials.expired and credentials.refresh_token:
-            credentials.refresh(Request())
-            with open(TOKEN_PATH, 'w') as token_file:
-                token_file.write(credentials.to_json())
-        
         # Create YouTube API client
         youtube = get_youtube_service(credentials)
         
@@ -270,7 +438,8 @@ async def upload_to_youtube(
         media = MediaFileUpload(
             video_path,
             mimetype="video/*",
-            resumable=True
+            resumable=True,
+            chunksize=UPLOAD_CHUNK_SIZE
         )
         print("Uploading video to YouTube...")
         request = youtube.videos().insert(
@@ -278,7 +447,16 @@ async def upload_to_youtube(
             body=body,
             media_body=media
         )
-        response = request.execute()
+        # Upload chunk by chunk so transient errors resume instead of restarting
+        response = None
+        async with _upload_lock:
+            while response is None:
+                _, response = await asyncio.to_thread(
+                    request.next_chunk,
+                    num_retries=UPLOAD_NUM_RETRIES
+                )
+        # The upload has read the whole file; don't let it crowd the page cache
+        await asyncio.to_thread(_drop_page_cache, video_path)
         # os.remove(video_path) # Optional: delete the video file after upload
 
         return {
@@ -312,7 +490,8 @@ async def upload_from_url(
         privacy_status: Privacy status (private/public/unlisted)
     """
     try:
-        if not os.path.exists(TOKEN_PATH):
+        credentials = await _ensure_credentials()
+        if credentials is None:
             return UploadResponse(
                 success=False,
                 message="User is not authenticated with YouTube. Please authenticate first."
@@ -330,7 +509,8 @@ async def upload_from_url(
             title,
             description,
             tags,
-            privacy_status
+            privacy_status,
+            credentials=credentials
         )
         
         return UploadResponse(